@@ -3,6 +3,7 @@ import os
 import random
 import time
 import copy
+from collections import Counter
 
 class Player:
     def __init__(self, name, hp, max_hp, attack_power, level, xp, current_location, inventory=None):
@@ -21,6 +22,7 @@ class Player:
         self.completed_quests = []
         self.dialogue_history = set()
         self.current_combat_target = None
+        self.arena_best_wave = 0
 
     def get_attack_power(self):
         total_power = self.attack_power
@@ -132,49 +134,484 @@ class Quest:
         self.is_complete = False
         self.lead_in = lead_in
 
-def load_game_data(filepath="game_data.json"):
-    with open(filepath, 'r') as f:
-        data = json.load(f)
-    items = {}
-    for name, details in data['items'].items():
-        item_type = details.pop('type', 'Item')
-        if item_type == 'Weapon':
-            items[name] = Weapon(name=name, **details)
-        elif item_type == 'Armor':
-            items[name] = Armor(name=name, **details)
-        elif item_type == 'Potion':
-            items[name] = Potion(name=name, **details)
-        elif item_type == 'Readable':
-            items[name] = Readable(name=name, **details)
-        else:
-            items[name] = Item(name=name, **details)
-    monsters = {name: Monster(name=name, **details) for name, details in data['monsters'].items()}
-    npcs = {name: NPC(name=name, **details) for name, details in data.get('npcs', {}).items()}
-    if "Wandering Scholar" in npcs:
-        npcs["Wandering Scholar"].topics = {
-            "elenya": "Elenya is the keystone of the Veil. Without her, the kingdom will fall.",
-            "hollow spire": "The Hollow Spire is a place of dark rituals. I've only read about it in old texts.",
-            "veil": "The Celestial Veil protects us from the horrors of the void. But it is weakening."
-        }
-    quests = {name: Quest(name=name, **details) for name, details in data.get('quests', {}).items()}
-    if "Investigate the Hollow Clues" in quests:
-        quests["Investigate the Hollow Clues"].unlocks = ["Defeat the Cultist Lieutenant"]
+def build_item(name, details):
+    details = dict(details)
+    item_type = details.pop('type', 'Item')
+    if item_type == 'Weapon':
+        return Weapon(name=name, **details)
+    elif item_type == 'Armor':
+        return Armor(name=name, **details)
+    elif item_type == 'Potion':
+        return Potion(name=name, **details)
+    elif item_type == 'Readable':
+        return Readable(name=name, **details)
+    return Item(name=name, **details)
+
+def build_monster(name, details):
+    return Monster(name=name, **details)
+
+def build_npc(name, details):
+    return NPC(name=name, **details)
+
+def build_quest(name, details):
+    return Quest(name=name, **details)
+
+def build_location(name, details):
+    # Locations mutate their item lists and healing stations during play, so they
+    # get their own copy and the raw data stays usable for diffing on reload.
+    return Location(name=name, **copy.deepcopy(details))
 
+# Section name in game_data.json -> builder for a single definition in it.
+SECTION_BUILDERS = {
+    'items': build_item,
+    'monsters': build_monster,
+    'npcs': build_npc,
+    'quests': build_quest,
+    'locations': build_location,
+}
+
+def link_quest_requires(quests):
     # Post-process to add 'requires' to unlocked quests
+    for quest in quests.values():
+        quest.requires = None
     for quest in quests.values():
         if quest.unlocks:
             for unlocked_quest_name in quest.unlocks:
                 if unlocked_quest_name in quests:
                     quests[unlocked_quest_name].requires = quest.name
 
-    locations = {name: Location(name=name, **details) for name, details in data['locations'].items()}
+# Quest start types and the sections their 'ref' may name a definition in.
+# 'ask_topic' refs are written "NPC name:topic".
+START_REF_SECTIONS = {
+    'npc': ('npcs',),
+    'location_enter': ('locations',),
+    'item_pickup': ('items',),
+    'item_or_npc': ('items', 'npcs'),
+    'ask_topic': ('npcs',),
+}
+
+def start_refs(start):
+    # Yields (name, topic) for each definition a quest start trigger names.
+    refs = start.get('ref')
+    for ref in refs if isinstance(refs, list) else [refs]:
+        if start.get('type') == 'ask_topic':
+            npc_name, _, topic = ref.partition(':')
+            yield npc_name, topic
+        else:
+            yield ref, None
+
+def goal_references(goal):
+    # Yields (section, name) for everything a quest goal points at.
+    if not goal:
+        return
+    if goal.get('type') == 'composite':
+        for requirement in goal.get('requirements', []):
+            yield from goal_references(requirement)
+    elif goal.get('type') == 'kill':
+        yield 'monsters', goal.get('target')
+    else:
+        for target in goal.get('targets', []):
+            yield 'items', target
+
+def quest_references(quest_details, data):
+    start = quest_details.get('start') or {}
+    sections = START_REF_SECTIONS.get(start.get('type'), ())
+    for name, _ in start_refs(start):
+        for section in sections:
+            if name in data.get(section, {}):
+                yield section, name
+    yield from goal_references(quest_details.get('goal'))
+    yield from goal_references(quest_details.get('alternate_goal'))
+    for key in ('reward', 'on_accept'):
+        item_name = (quest_details.get(key) or {}).get('item')
+        if item_name:
+            yield 'items', item_name
+
+ITEM_TYPE_FIELDS = {
+    'Item': (),
+    'Weapon': ('damage',),
+    'Armor': ('defense',),
+    'Potion': ('heal_amount',),
+    'Readable': (),
+}
+
+COLLECT_GOAL_TYPES = ('collect_all', 'collect_or_kill', 'collect_or_talk')
+
+def validate_game_data(data):
+    # Checks the shape of every record before following its references, and
+    # collects every problem instead of stopping at the first one.
+    errors = []
+
+    def expect(value, kind, where):
+        names = {dict: "an object", list: "a list", str: "a string", (int, float): "a number"}
+        if isinstance(value, kind) and not isinstance(value, bool):
+            return True
+        errors.append(f"{where}: expected {names[kind]}, got {json.dumps(value)}")
+        return False
+
+    def expect_field(details, key, kind, where, required=True):
+        if key not in details or details[key] is None:
+            if required:
+                errors.append(f"{where}: missing '{key}'")
+            return False
+        return expect(details[key], kind, f"{where}.{key}")
+
+    def expect_names(details, key, section, where):
+        if expect_field(details, key, list, where, required=False):
+            for i, name in enumerate(details[key]):
+                check(section, name, f"{where}.{key}[{i}]")
+
+    def check(section, name, where):
+        if not isinstance(name, str) or name not in sections[section]:
+            errors.append(f"{where}: unknown {section[:-1]} {json.dumps(name)}")
+
+    def check_goal(goal, where):
+        if not expect(goal, dict, where):
+            return
+        goal_type = goal.get('type')
+        if goal_type == 'composite':
+            if expect_field(goal, 'requirements', list, where):
+                for i, requirement in enumerate(goal['requirements']):
+                    check_goal(requirement, f"{where}.requirements[{i}]")
+        elif goal_type == 'kill':
+            check('monsters', goal.get('target'), f"{where}.target")
+        elif goal_type in COLLECT_GOAL_TYPES:
+            if expect_field(goal, 'targets', list, where):
+                for i, target in enumerate(goal['targets']):
+                    check('items', target, f"{where}.targets[{i}]")
+        else:
+            errors.append(f"{where}: unknown goal type {json.dumps(goal_type)}")
+        expect_field(goal, 'count', (int, float), where, required=False)
+
+    def check_heal(service, where):
+        if expect(service, dict, where) and expect_field(service, 'type', str, where):
+            if service['type'] != 'full':
+                expect_field(service, 'amount', (int, float), where)
+
+    if not expect(data, dict, "game data"):
+        raise ValueError("Invalid game data:\n  - " + "\n  - ".join(errors))
+
+    # Only definitions that are objects are walked below; the rest are
+    # reported here and still count as names for cross-references.
+    sections = {}
+    definitions = {}
+    for section in SECTION_BUILDERS:
+        value = data.get(section, {})
+        if section not in data and section in ('locations', 'items', 'monsters'):
+            errors.append(f"missing section '{section}'")
+        if not expect(value, dict, section):
+            value = {}
+        sections[section] = value
+        definitions[section] = {}
+        for name, details in value.items():
+            if expect(details, dict, f"{section}['{name}']"):
+                definitions[section][name] = details
+
+    if expect_field(data, 'player', dict, "game data"):
+        for key in ('hp', 'max_hp', 'attack_power', 'level', 'xp'):
+            expect_field(data['player'], key, (int, float), "player")
+    check('locations', data.get('player_start'), "player_start")
+
+    for loc_name, details in definitions['locations'].items():
+        where = f"locations['{loc_name}']"
+        expect_field(details, 'description', str, where)
+        if expect_field(details, 'exits', dict, where):
+            for direction, dest in details['exits'].items():
+                check('locations', dest, f"{where}.exits['{direction}']")
+        for section in ('items', 'monsters', 'npcs'):
+            expect_names(details, section, section, where)
+        if details.get('healing_station') is not None:
+            station = details['healing_station']
+            check_heal(station, f"{where}.healing_station")
+            if isinstance(station, dict):
+                expect_field(station, 'uses', (int, float), f"{where}.healing_station")
+
+    for item_name, details in definitions['items'].items():
+        where = f"items['{item_name}']"
+        expect_field(details, 'description', str, where)
+        item_type = details.get('type', 'Item')
+        if not isinstance(item_type, str) or item_type not in ITEM_TYPE_FIELDS:
+            errors.append(f"{where}.type: unknown item type {json.dumps(item_type)}")
+        else:
+            for key in ITEM_TYPE_FIELDS[item_type]:
+                expect_field(details, key, (int, float), where)
+
+    for monster_name, details in definitions['monsters'].items():
+        where = f"monsters['{monster_name}']"
+        expect_field(details, 'hp', (int, float), where)
+        expect_field(details, 'attack_power', (int, float), where)
+        expect_field(details, 'xp', (int, float), where, required=False)
+        expect_names(details, 'loot', 'items', where)
+        if expect_field(details, 'drop_table', list, where, required=False):
+            for i, drop in enumerate(details['drop_table']):
+                drop_where = f"{where}.drop_table[{i}]"
+                if expect(drop, dict, drop_where):
+                    check('items', drop.get('item'), f"{drop_where}.item")
+                    expect_field(drop, 'chance', (int, float), drop_where)
+
+    for npc_name, details in definitions['npcs'].items():
+        where = f"npcs['{npc_name}']"
+        if expect_field(details, 'dialogue', list, where, required=False):
+            for i, line in enumerate(details['dialogue']):
+                expect(line, str, f"{where}.dialogue[{i}]")
+        expect_names(details, 'quests', 'quests', where)
+        if expect_field(details, 'topics', dict, where, required=False):
+            for topic, answer in details['topics'].items():
+                expect(answer, str, f"{where}.topics['{topic}']")
+        if not expect_field(details, 'services', dict, where, required=False):
+            continue
+        services = details['services']
+        if 'heal' in services:
+            check_heal(services['heal'], f"{where}.services.heal")
+        if 'arena' in services:
+            arena_where = f"{where}.services.arena"
+            arena = services['arena']
+            if expect(arena, dict, arena_where):
+                expect_field(arena, 'stat_scale', (int, float), arena_where, required=False)
+                expect_field(arena, 'xp_per_wave', (int, float), arena_where, required=False)
+                if expect_field(arena, 'waves', list, arena_where):
+                    for i, wave in enumerate(arena['waves']):
+                        if expect(wave, list, f"{arena_where}.waves[{i}]"):
+                            for monster_name in wave:
+                                check('monsters', monster_name, f"{arena_where}.waves[{i}]")
+
+    for quest_name, details in definitions['quests'].items():
+        where = f"quests['{quest_name}']"
+        expect_field(details, 'description', str, where)
+        if 'goal' not in details:
+            errors.append(f"{where}: missing 'goal'")
+        else:
+            check_goal(details['goal'], f"{where}.goal")
+        if details.get('alternate_goal') is not None:
+            check_goal(details['alternate_goal'], f"{where}.alternate_goal")
+        for key in ('reward', 'on_accept'):
+            if expect_field(details, key, dict, where, required=(key == 'reward')):
+                if details[key].get('item') is not None:
+                    check('items', details[key]['item'], f"{where}.{key}.item")
+                expect_field(details[key], 'xp', (int, float), f"{where}.{key}", required=False)
+        if details.get('prerequisite') is not None:
+            check('quests', details['prerequisite'], f"{where}.prerequisite")
+        expect_names(details, 'unlocks', 'quests', where)
+
+        if not expect_field(details, 'start', dict, where, required=False):
+            continue
+        start = details['start']
+        refs = start.get('ref')
+        start_type = start.get('type')
+        sections_for_type = START_REF_SECTIONS.get(start_type) if isinstance(start_type, str) else None
+        if sections_for_type is None:
+            errors.append(f"{where}.start: unknown start type {json.dumps(start_type)}")
+        elif not all(isinstance(ref, str) for ref in (refs if isinstance(refs, list) else [refs])):
+            errors.append(f"{where}.start.ref: expected a string or a list of strings, got {json.dumps(refs)}")
+        else:
+            for name, topic in start_refs(start):
+                if not any(name in sections[section] for section in sections_for_type):
+                    kinds = " or ".join(section[:-1] for section in sections_for_type)
+                    errors.append(f"{where}.start: unknown {kinds} '{name}'")
+                elif topic is not None and topic not in ((definitions['npcs'].get(name) or {}).get('topics') or {}):
+                    errors.append(f"{where}.start: {name} has no topic '{topic}'")
+
+    if errors:
+        raise ValueError("Invalid game data:\n  - " + "\n  - ".join(errors))
+
+def build_content_indexes(data):
+    # Reverse lookups over the validated data, so the game never has to scan
+    # every definition to answer "where does X come from" or "who uses X".
+    indexes = {
+        'monster_spawns': {},       # monster -> locations that spawn it
+        'item_locations': {},       # item -> locations it starts in
+        'item_drops': {},           # item -> monsters that drop it
+        'item_rewards': {},         # item -> quests that give it
+        'quest_givers': {},         # quest -> NPCs that offer it
+        'quests_by_start': {},      # (start type, ref) -> quests it can unlock
+        'quests_by_reference': {},  # (section, name) -> quests that mention it
+        'item_names': {name.lower(): name for name in data['items']},
+        'monster_names': {name.lower(): name for name in data['monsters']},
+    }
+    for loc_name, details in data['locations'].items():
+        for monster_name in dict.fromkeys(details.get('monsters') or []):
+            indexes['monster_spawns'].setdefault(monster_name, []).append(loc_name)
+        for item_name in dict.fromkeys(details.get('items') or []):
+            indexes['item_locations'].setdefault(item_name, []).append(loc_name)
+    for monster_name, details in data['monsters'].items():
+        dropped = (details.get('loot') or []) + [drop['item'] for drop in details.get('drop_table') or []]
+        for item_name in dict.fromkeys(dropped):
+            indexes['item_drops'].setdefault(item_name, []).append(monster_name)
+    for npc_name, details in data.get('npcs', {}).items():
+        for quest_name in details.get('quests') or []:
+            indexes['quest_givers'].setdefault(quest_name, []).append(npc_name)
+    for quest_name, details in data.get('quests', {}).items():
+        start = details.get('start') or {}
+        refs = start.get('ref')
+        for ref in refs if isinstance(refs, list) else [refs]:
+            indexes['quests_by_start'].setdefault((start.get('type'), ref), []).append(quest_name)
+        for reference in dict.fromkeys(quest_references(details, data)):
+            indexes['quests_by_reference'].setdefault(reference, []).append(quest_name)
+        reward_item = (details.get('reward') or {}).get('item')
+        if reward_item:
+            indexes['item_rewards'].setdefault(reward_item, []).append(quest_name)
+    return indexes
+
+def load_game_data(filepath="game_data.json"):
+    with open(filepath, 'r') as f:
+        data = json.load(f)
+    validate_game_data(data)
+    items = {name: build_item(name, details) for name, details in data['items'].items()}
+    monsters = {name: build_monster(name, details) for name, details in data['monsters'].items()}
+    npcs = {name: build_npc(name, details) for name, details in data.get('npcs', {}).items()}
+    quests = {name: build_quest(name, details) for name, details in data.get('quests', {}).items()}
+    link_quest_requires(quests)
+
+    locations = {name: build_location(name, details) for name, details in data['locations'].items()}
 
     quest_dialogue_map = {
         "Clear the Woods": "Shadows are stirring in Shademire Woods.",
         "Clear the Catacombs": "If you can clear the catacombs of undead, the roads will be safer."
     }
 
-    return data, items, monsters, locations, npcs, quests, quest_dialogue_map
+    indexes = build_content_indexes(data)
+
+    return data, items, monsters, locations, npcs, quests, quest_dialogue_map, indexes
+
+def diff_section(old_section, new_section):
+    changed = [name for name, details in new_section.items() if old_section.get(name) != details]
+    removed = [name for name in old_section if name not in new_section]
+    return changed, removed
+
+def apply_list_delta(live, old_list, new_list):
+    # Adds what the definition newly lists and drops what it no longer lists,
+    # leaving everything that happened in the room during play in place.
+    live = list(live)
+    for name, count in (Counter(old_list) - Counter(new_list)).items():
+        for _ in range(count):
+            if name in live:
+                live.remove(name)
+    added = Counter(new_list) - Counter(old_list)
+    for name in new_list:
+        if added[name] > 0:
+            live.append(name)
+            added[name] -= 1
+    return live
+
+def migrate_location(old_loc, new_loc, old_details, new_details, combat_target_name=None):
+    # Carry the room's live state over, changing only what its definition changed.
+    new_loc.items = apply_list_delta(old_loc.items, old_details.get('items') or [], new_details.get('items') or [])
+    new_loc.active_monsters = apply_list_delta(old_loc.active_monsters, old_details.get('monsters') or [], new_details.get('monsters') or [])
+    if old_details.get('healing_station') == new_details.get('healing_station'):
+        new_loc.healing_station = old_loc.healing_station
+    elif old_loc.healing_station and new_loc.healing_station:
+        # A retuned station keeps the uses already spent, up to its new limit.
+        new_loc.healing_station['uses'] = min(old_loc.healing_station['uses'], new_loc.healing_station['uses'])
+    # The monster the player is fighting here stays until the fight ends.
+    if combat_target_name and combat_target_name not in new_loc.active_monsters:
+        new_loc.active_monsters.append(combat_target_name)
+
+def migrate_player(player, items, quests, changes):
+    changed_items = changes.get('items', [])
+    if player.equipped_weapon and player.equipped_weapon.name in changed_items:
+        new_weapon = items.get(player.equipped_weapon.name)
+        if isinstance(new_weapon, Weapon):
+            player.equipped_weapon = new_weapon
+    if player.equipped_armor and player.equipped_armor.name in changed_items:
+        new_armor = items.get(player.equipped_armor.name)
+        if isinstance(new_armor, Armor):
+            player.equipped_armor = new_armor
+
+    # Active quests are copies, so carry their progress over to the new definition.
+    for quest_name in changes.get('quests', []):
+        old_quest = player.active_quests.get(quest_name)
+        if old_quest and quest_name in quests:
+            new_quest = copy.deepcopy(quests[quest_name])
+            new_quest.progress = old_quest.progress
+            new_quest.is_complete = old_quest.is_complete
+            player.active_quests[quest_name] = new_quest
+
+def find_removed_in_use(player, locations, game_data, new_data, removed):
+    # The live game refers to items, monsters and quests by name, so a reload
+    # may not drop a definition that the player or a room still points at.
+    removed_items = set(removed['items'])
+    removed_monsters = set(removed['monsters'])
+    in_use = []
+
+    carried = list(player.inventory)
+    carried += [gear.name for gear in (player.equipped_weapon, player.equipped_armor) if gear]
+    for item_name in dict.fromkeys(carried):
+        if item_name in removed_items:
+            in_use.append(f"item '{item_name}' (carried by the player)")
+    for quest_name in player.active_quests:
+        if quest_name in removed['quests']:
+            in_use.append(f"quest '{quest_name}' (active)")
+    if player.current_combat_target:
+        if player.current_combat_target.name in removed_monsters:
+            in_use.append(f"monster '{player.current_combat_target.name}' (fighting the player)")
+        if player.current_location in removed['locations']:
+            in_use.append(f"location '{player.current_location}' (the player is fighting there)")
+
+    for loc_name, location in locations.items():
+        new_details = new_data['locations'].get(loc_name)
+        if new_details is None:
+            continue
+        # Check the lists as they will be once the definition delta is applied.
+        old_details = game_data['locations'][loc_name]
+        live_items = apply_list_delta(location.items, old_details.get('items') or [], new_details.get('items') or [])
+        for item_name in dict.fromkeys(live_items):
+            if item_name in removed_items:
+                in_use.append(f"item '{item_name}' (lying in {loc_name})")
+        live_monsters = apply_list_delta(location.active_monsters, old_details.get('monsters') or [], new_details.get('monsters') or [])
+        for monster_name in dict.fromkeys(live_monsters):
+            if monster_name in removed_monsters:
+                in_use.append(f"monster '{monster_name}' (in {loc_name})")
+    return in_use
+
+def reload_game_data(game_data, items, monsters, locations, npcs, quests, indexes, player, filepath="game_data.json"):
+    with open(filepath, 'r') as f:
+        new_data = json.load(f)
+    validate_game_data(new_data)
+    targets = {'items': items, 'monsters': monsters, 'npcs': npcs, 'quests': quests, 'locations': locations}
+
+    # Build every changed definition before touching the live world, so a bad
+    # edit raises here and leaves the running game as it was.
+    rebuilt = {}
+    removed = {}
+    for section, build in SECTION_BUILDERS.items():
+        old_section = game_data.get(section, {})
+        new_section = new_data.get(section, {})
+        changed_names, removed_names = diff_section(old_section, new_section)
+        rebuilt[section] = {name: build(name, new_section[name]) for name in changed_names}
+        removed[section] = removed_names
+
+    in_use = find_removed_in_use(player, locations, game_data, new_data, removed)
+    if in_use:
+        raise ValueError("Reload would remove definitions still in use:\n  - " + "\n  - ".join(in_use))
+
+    changes = {}
+    for section, objects in rebuilt.items():
+        target = targets[section]
+        for name in removed[section]:
+            del target[name]
+        for name, obj in objects.items():
+            if section == 'locations' and name in target:
+                combat_target_name = None
+                if player.current_combat_target and name == player.current_location:
+                    combat_target_name = player.current_combat_target.name
+                migrate_location(target[name], obj, game_data['locations'][name], new_data['locations'][name], combat_target_name)
+            target[name] = obj
+        if objects or removed[section]:
+            changes[section] = list(objects) + removed[section]
+
+    if 'quests' in changes:
+        link_quest_requires(quests)
+    migrate_player(player, items, quests, changes)
+    if player.current_location not in locations:
+        player.current_location = new_data['player_start']
+    if player.previous_location not in locations:
+        player.previous_location = player.current_location
+
+    indexes.clear()
+    indexes.update(build_content_indexes(new_data))
+    game_data.clear()
+    game_data.update(new_data)
+    return changes
 
 def clear_screen():
     if os.name == "nt":
@@ -196,10 +633,12 @@ def print_help():
     print("  - use [potion]: Use a potion to heal")
     print("  - heal: Use a healing service from an NPC.")
     print("  - rest: Use a healing station to restore health.")
+    print("  - arena: Enter the Trials of Light, if an arena master is nearby.")
     print("  - examine [item]: Examine an item in your inventory")
     print("  - ask [npc] [topic]: Ask an NPC about a specific topic.")
     print("  - talk [npc]: Talk to an NPC")
     print("  - quests: View your active quests")
+    print("  - where [item/monster]: Recall where an item or monster can be found")
     print("  - help: Show this help screen")
     print("  - quit: Exit the game")
 
@@ -239,53 +678,64 @@ def show_location(location, npcs, player, quests):
     if hasattr(location, 'healing_station') and location.healing_station and location.healing_station.get('uses', 0) > 0:
         print("🔹 You can `rest` here to heal.")
 
+def show_sources(target_name, indexes):
+    item_name = indexes['item_names'].get(target_name.lower())
+    monster_name = indexes['monster_names'].get(target_name.lower())
+    if not item_name and not monster_name:
+        print(f"You have never heard of a {target_name}.")
+        return
+
+    if monster_name:
+        spawns = indexes['monster_spawns'].get(monster_name, [])
+        print(f"{monster_name} lurks in: {', '.join(spawns) if spawns else 'nowhere known'}")
+    if item_name:
+        lines = []
+        locations_found = indexes['item_locations'].get(item_name, [])
+        if locations_found:
+            lines.append(f"  - Lying in: {', '.join(locations_found)}")
+        for dropper in indexes['item_drops'].get(item_name, []):
+            spawns = indexes['monster_spawns'].get(dropper, [])
+            lines.append(f"  - Dropped by: {dropper}" + (f" ({', '.join(spawns)})" if spawns else ""))
+        for quest_name in indexes['item_rewards'].get(item_name, []):
+            lines.append(f"  - Reward for: {quest_name}")
+        print(f"Where to get the {item_name}:")
+        print("\n".join(lines) if lines else "  - Nowhere known")
+
 def handle_look(location, npcs, player, quests):
     clear_screen()
     show_location(location, npcs, player, quests)
 
-def check_quest_availability(player, quests, trigger_type, trigger_ref):
-    for quest_name, quest in quests.items():
+def check_quest_availability(player, quests, indexes, trigger_type, trigger_ref):
+    for quest_name in indexes['quests_by_start'].get((trigger_type, trigger_ref), []):
+        quest = quests[quest_name]
         if quest_name in player.active_quests or quest_name in player.completed_quests:
             continue
         if quest.requires and quest.requires not in player.completed_quests:
             continue
-        if not quest.start:
+        # NPC quests are handled via talk, so we ignore them here.
+        if quest.start.get('type') == 'npc':
             continue
 
-        start_type = quest.start.get('type')
-        start_ref = quest.start.get('ref')
+        # Auto-offer the quest
+        print(f"\nA new quest has become available: \"{quest.name}\"")
+        print(f"- {quest.description}")
+        reward_item = quest.reward.get('item', 'nothing')
+        if not reward_item: reward_item = 'nothing'
+        print(f"Reward: {quest.reward.get('xp', 0)} XP, {reward_item}")
 
-        unlocked = False
-        if start_type == trigger_type:
-            # NPC quests are handled via talk, so we ignore them here.
-            if quest.start.get('type') == 'npc':
-                continue
-            if isinstance(start_ref, list) and trigger_ref in start_ref:
-                unlocked = True
-            elif trigger_ref == start_ref:
-                unlocked = True
-
-        if unlocked:
-            # Auto-offer the quest
-            print(f"\nA new quest has become available: \"{quest.name}\"")
-            print(f"- {quest.description}")
-            reward_item = quest.reward.get('item', 'nothing')
-            if not reward_item: reward_item = 'nothing'
-            print(f"Reward: {quest.reward.get('xp', 0)} XP, {reward_item}")
-
-            accept = input("Accept? (yes/no) > ").lower()
-            if accept == 'yes':
-                player.active_quests[quest_name] = copy.deepcopy(quest)
-                print(f"Quest accepted: \"{quest_name}\"")
-                if 'item' in quest.on_accept and quest.on_accept['item']:
-                    item_name = quest.on_accept['item']
-                    player.inventory.append(item_name)
-                    print(f"You receive a {item_name}.")
+        accept = input("Accept? (yes/no) > ").lower()
+        if accept == 'yes':
+            player.active_quests[quest_name] = copy.deepcopy(quest)
+            print(f"Quest accepted: \"{quest_name}\"")
+            if 'item' in quest.on_accept and quest.on_accept['item']:
+                item_name = quest.on_accept['item']
+                player.inventory.append(item_name)
+                print(f"You receive a {item_name}.")
 
-                # Immediately check if the quest is already complete
-                check_collect_quests(player, quests)
-            else:
-                print("You have declined the quest.")
+            # Immediately check if the quest is already complete
+            check_collect_quests(player, quests, indexes)
+        else:
+            print("You have declined the quest.")
 
 def print_combat_banner(player):
     monster = player.current_combat_target
@@ -311,7 +761,7 @@ def handle_quest_completion(player, quest, quests):
                 if unlocked_quest.requires == quest.name:
                      print(f"You feel you can now pursue a new goal: \"{unlocked_quest_name}\"")
 
-def check_collect_quests(player, quests, talked_to_npc=None):
+def check_collect_quests(player, quests, indexes, talked_to_npc=None):
     for quest_name, quest in player.active_quests.items():
         if quest.is_complete:
             continue
@@ -328,9 +778,8 @@ def check_collect_quests(player, quests, talked_to_npc=None):
                     break
 
         elif goal_type == 'collect_or_talk' and talked_to_npc:
-            # This type requires talking to a specific NPC.
-            # This is a hardcoded check for the specific quest in the game data.
-            if quest.name == "Investigate the Hollow Clues" and talked_to_npc.name == "Wandering Scholar":
+            # This type requires talking to an NPC who gives the quest.
+            if talked_to_npc.name in indexes['quest_givers'].get(quest.name, []):
                 targets = goal.get('targets', [])
                 for target_item in targets:
                     if target_item in player.inventory:
@@ -340,19 +789,244 @@ def check_collect_quests(player, quests, talked_to_npc=None):
         if quest.progress >= quest.goal.get('count', 1) and not quest.is_complete:
             handle_quest_completion(player, quest, quests)
 
+class Combatant:
+    def __init__(self, name, hp, attack_power, defense=0, xp=0, loot=None, drop_table=None):
+        self.name = name
+        self.hp = hp
+        self.attack_power = attack_power
+        self.defense = defense
+        self.xp = xp
+        self.loot = loot if loot is not None else []
+        self.drop_table = drop_table if drop_table is not None else []
+
+def player_combatant(player):
+    defense = player.equipped_armor.defense if player.equipped_armor else 0
+    return Combatant("You", player.hp, player.get_attack_power(), defense=defense)
+
+def monster_combatant(monster, stat_multiplier=1.0):
+    return Combatant(
+        monster.name,
+        max(1, round(monster.hp * stat_multiplier)),
+        max(1, round(monster.attack_power * stat_multiplier)),
+        xp=round(monster.xp * stat_multiplier),
+        loot=monster.loot,
+        drop_table=monster.drop_table
+    )
+
+def calculate_damage(attack_power, defense=0):
+    return max(0, attack_power - defense)
+
+def roll_drops(drop_table, rng):
+    return [drop['item'] for drop in drop_table if rng.random() < drop['chance']]
+
+# The resolve_* functions below never print or touch the Player; they take
+# combatants and an RNG and return fresh combatants plus a list of events:
+#   ("player_hit", enemy_name, damage)     ("enemy_hit", enemy_name, damage)
+#   ("enemy_defeated", enemy_name, xp)     ("drop", enemy_name, item_name)
+#   ("player_defeated",)                   ("wave_cleared", wave_number)
+def resolve_player_attack(fighter, enemies, rng, target_index=None):
+    enemies = [copy.copy(enemy) for enemy in enemies]
+    living = [i for i, enemy in enumerate(enemies) if enemy.hp > 0]
+    if not living:
+        return fighter, enemies, []
+    if target_index is None or target_index not in living:
+        target_index = living[0]
+    target = enemies[target_index]
+    damage = calculate_damage(fighter.attack_power, target.defense)
+    target.hp -= damage
+    events = [("player_hit", target.name, damage)]
+    if target.hp <= 0:
+        events.append(("enemy_defeated", target.name, target.xp))
+        for item_name in roll_drops(target.drop_table, rng):
+            events.append(("drop", target.name, item_name))
+    return fighter, enemies, events
+
+def resolve_enemy_attacks(fighter, enemies):
+    fighter = copy.copy(fighter)
+    events = []
+    for enemy in enemies:
+        if enemy.hp <= 0:
+            continue
+        damage = calculate_damage(enemy.attack_power, fighter.defense)
+        fighter.hp -= damage
+        events.append(("enemy_hit", enemy.name, damage))
+        if fighter.hp <= 0:
+            events.append(("player_defeated",))
+            break
+    return fighter, enemies, events
+
+def resolve_round(fighter, enemies, rng, target_index=None):
+    fighter, enemies, events = resolve_player_attack(fighter, enemies, rng, target_index)
+    fighter, enemies, enemy_events = resolve_enemy_attacks(fighter, enemies)
+    return fighter, enemies, events + enemy_events
+
+def resolve_fight(fighter, enemies, rng, max_rounds=100):
+    events = []
+    for _ in range(max_rounds):
+        if fighter.hp <= 0 or all(enemy.hp <= 0 for enemy in enemies):
+            break
+        fighter, enemies, round_events = resolve_round(fighter, enemies, rng)
+        events.extend(round_events)
+    return fighter, enemies, events
+
+def scale_wave(monsters, wave, wave_index, stat_scale):
+    multiplier = 1 + stat_scale * wave_index
+    return [monster_combatant(monsters[name], multiplier) for name in wave]
+
+def resolve_trial(fighter, monsters, waves, stat_scale, rng, start_wave=0, enemies=None):
+    # Auto-resolves every remaining wave, continuing the partly fought one if
+    # enemies are given. Returns the total number of waves cleared and the
+    # enemies of the wave it stopped in (None once every wave is cleared).
+    events = []
+    waves_cleared = start_wave
+    while waves_cleared < len(waves):
+        if enemies is None:
+            enemies = scale_wave(monsters, waves[waves_cleared], waves_cleared, stat_scale)
+        fighter, enemies, wave_events = resolve_fight(fighter, enemies, rng)
+        events.extend(wave_events)
+        if fighter.hp <= 0 or any(enemy.hp > 0 for enemy in enemies):
+            break
+        waves_cleared += 1
+        events.append(("wave_cleared", waves_cleared))
+        enemies = None
+    return fighter, waves_cleared, enemies, events
+
+def print_combat_events(events):
+    for event in events:
+        kind = event[0]
+        if kind == "player_hit":
+            print(f"You attack the {event[1]} for {event[2]} damage.")
+        elif kind == "enemy_hit":
+            print(f"{event[1]} attacks you for {event[2]} damage.")
+        elif kind == "enemy_defeated":
+            print(f"You defeated the {event[1]}!")
+        elif kind == "drop":
+            print(f"The {event[1]} dropped a {event[2]}.")
+        elif kind == "player_defeated":
+            print("You have been defeated.")
+        elif kind == "wave_cleared":
+            print(f"Wave {event[1]} cleared!")
+
+def handle_arena(player, arena_npc, monsters, items, rng=random):
+    trial = arena_npc.services['arena']
+    waves = trial['waves']
+    stat_scale = trial.get('stat_scale', 0)
+    xp_per_wave = trial.get('xp_per_wave', 0)
+
+    print(f"\n--- The Trials of Light: {len(waves)} waves ---")
+    print("Arena actions: attack [enemy], use [potion], auto (this wave), auto all, flee")
+    fighter = player_combatant(player)
+    waves_cleared = 0
+    earned_xp = 0
+    wave_xp = 0
+    enemies = None
+    while waves_cleared < len(waves) and fighter.hp > 0:
+        if enemies is None:
+            enemies = scale_wave(monsters, waves[waves_cleared], waves_cleared, stat_scale)
+            print(f"\nWave {waves_cleared + 1}: {', '.join(enemy.name for enemy in enemies)}")
+        living = [enemy for enemy in enemies if enemy.hp > 0]
+        print(f"Your HP: {fighter.hp} / {player.max_hp} | Enemies: {', '.join(f'{enemy.name} ({enemy.hp} HP)' for enemy in living)}")
+
+        parts = input("Arena> ").lower().strip().split()
+        if not parts:
+            continue
+        action = parts[0]
+        target_name = " ".join(parts[1:])
+        events = []
+        if action == "flee":
+            print("You step out of the circle of light.")
+            break
+        elif action == "auto" and target_name == "all":
+            fighter, waves_cleared, enemies, events = resolve_trial(fighter, monsters, waves, stat_scale, rng, waves_cleared, enemies)
+        elif action == "auto":
+            fighter, enemies, events = resolve_fight(fighter, enemies, rng)
+        elif action == "attack":
+            target_index = None
+            if target_name:
+                for i, enemy in enumerate(enemies):
+                    if enemy.hp > 0 and enemy.name.lower() == target_name:
+                        target_index = i
+                        break
+                if target_index is None:
+                    print(f"There is no {target_name} in this wave.")
+                    continue
+            fighter, enemies, events = resolve_round(fighter, enemies, rng, target_index)
+        elif action == "use":
+            potion = None
+            for item_name in player.inventory:
+                if target_name == item_name.lower() and isinstance(items.get(item_name), Potion):
+                    potion = items[item_name]
+                    break
+            if not potion:
+                print("You can't use that.")
+                continue
+            player.inventory.remove(potion.name)
+            healed_amount = min(potion.heal_amount, player.max_hp - fighter.hp)
+            fighter.hp += healed_amount
+            print(f"You use the {potion.name} and heal for {healed_amount} HP.")
+            fighter, enemies, events = resolve_enemy_attacks(fighter, enemies)
+        else:
+            print("Arena actions: attack [enemy], use [potion], auto (this wave), auto all, flee")
+            continue
+
+        if enemies is not None and fighter.hp > 0 and all(enemy.hp <= 0 for enemy in enemies):
+            waves_cleared += 1
+            enemies = None
+            events.append(("wave_cleared", waves_cleared))
+
+        # Trial enemies are conjured by the light and leave nothing behind, and
+        # the light pulls a beaten player out rather than letting them fall.
+        print_combat_events([event for event in events if event[0] not in ("drop", "player_defeated")])
+        # A wave pays its kills and bonus only the first time the player clears
+        # it, so losing or replaying the early waves earns nothing.
+        for event in events:
+            if event[0] == "enemy_defeated":
+                wave_xp += event[2]
+            elif event[0] == "wave_cleared":
+                if event[1] > player.arena_best_wave:
+                    earned_xp += wave_xp + xp_per_wave * event[1]
+                    player.arena_best_wave = event[1]
+                wave_xp = 0
+
+    if fighter.hp <= 0:
+        print("The light pulls you from the arena before the final blow lands.")
+    elif waves_cleared == len(waves):
+        print("You have completed the Trials of Light!")
+    player.hp = max(1, fighter.hp)
+
+    print(f"Waves cleared: {waves_cleared}/{len(waves)} (best: {player.arena_best_wave})")
+    if earned_xp:
+        player.gain_xp(earned_xp)
+
 def handle_monster_turn(player, monster):
-    monster_attack = monster.attack_power
-    if player.equipped_armor:
-        monster_attack = max(0, monster_attack - player.equipped_armor.defense)
-    player.hp -= monster_attack
-    print(f"{monster.name} attacks you for {monster_attack} damage.")
+    fighter, _, events = resolve_enemy_attacks(player_combatant(player), [monster])
+    player.hp = fighter.hp
+    print_combat_events(events)
     print(f"You have {player.hp} HP left.")
-    if player.hp <= 0:
-        return False
-    return True
+    return player.hp > 0
+
+def check_for_reload(game_data, items, monsters, locations, npcs, quests, indexes, player, last_mtime, filepath="game_data.json"):
+    try:
+        mtime = os.path.getmtime(filepath)
+    except OSError:
+        return last_mtime
+    if mtime == last_mtime:
+        return last_mtime
+    try:
+        changes = reload_game_data(game_data, items, monsters, locations, npcs, quests, indexes, player, filepath)
+    except Exception as e:
+        # Any bad edit - a half-saved file, a broken reference, a malformed
+        # entry - must not end the running game; try again on the next change.
+        print(f"(Could not reload game data: {e})")
+        return mtime
+    if changes:
+        summary = ", ".join(f"{len(names)} {section}" for section, names in changes.items())
+        print(f"(Game data reloaded: {summary} updated.)")
+    return mtime
 
 def main():
-    game_data, items, monsters, locations, npcs, quests, quest_dialogue_map = load_game_data()
+    game_data, items, monsters, locations, npcs, quests, quest_dialogue_map, indexes = load_game_data()
+    data_mtime = os.path.getmtime("game_data.json")
     player_data = game_data['player']
     player = Player(
         name="Player",
@@ -363,13 +1037,15 @@ def main():
         xp=player_data['xp'],
         current_location=game_data['player_start']
     )
-    check_quest_availability(player, quests, "location_enter", player.current_location)
+    check_quest_availability(player, quests, indexes, "location_enter", player.current_location)
     handle_look(locations[player.current_location], npcs, player, quests)
     while True:
         current_loc = locations[player.current_location]
         if player.current_combat_target:
             print_combat_banner(player)
         user_input = input("\n> ").lower().strip()
+        data_mtime = check_for_reload(game_data, items, monsters, locations, npcs, quests, indexes, player, data_mtime)
+        current_loc = locations[player.current_location]
         if not user_input:
             continue
         parts = user_input.split()
@@ -386,7 +1062,7 @@ def main():
                 player.current_location = exit_dest
                 new_loc = locations[player.current_location]
                 new_loc.active_monsters = list(new_loc.monsters)
-                check_quest_availability(player, quests, "location_enter", new_loc.name)
+                check_quest_availability(player, quests, indexes, "location_enter", new_loc.name)
                 handle_look(new_loc, npcs, player, quests)
             else:
                 print("Invalid exit number.")
@@ -408,7 +1084,7 @@ def main():
                 player.inventory.append(item_to_get)
                 current_loc.items.remove(item_to_get)
                 print(f"You pick up the {item_to_get}.")
-                check_quest_availability(player, quests, "item_pickup", item_to_get)
+                check_quest_availability(player, quests, indexes, "item_pickup", item_to_get)
                 # No longer check collect quests on get
             else:
                 print(f"You don't see a {target_name} here.")
@@ -426,8 +1102,8 @@ def main():
                 print(item_to_examine.description)
                 if isinstance(item_to_examine, Readable):
                     print(f"It reads: \"{item_to_examine.lore_text}\"")
-                check_quest_availability(player, quests, "item_pickup", item_to_examine.name)
-                check_quest_availability(player, quests, "item_or_npc", item_to_examine.name)
+                check_quest_availability(player, quests, indexes, "item_pickup", item_to_examine.name)
+                check_quest_availability(player, quests, indexes, "item_or_npc", item_to_examine.name)
             else:
                 print(f"You don't have a {target_name}.")
         elif command == "drop":
@@ -462,6 +1138,11 @@ def main():
                 for quest_name, quest in player.active_quests.items():
                     print(f"- {quest.name}: {quest.description} ({quest.progress}/{quest.goal.get('count', 1)})")
                 print("---------------------")
+        elif command == "where":
+            if not target_name:
+                print("Where is what?")
+                continue
+            show_sources(target_name, indexes)
         elif command == "ask":
             if not target_name:
                 print("Ask whom about what?")
@@ -480,8 +1161,8 @@ def main():
                     dialogue_key = f"{npc_to_ask.name}:{topic}"
                     player.dialogue_history.add(dialogue_key)
                     print(f'{npc_to_ask.name} says: "{npc_to_ask.topics[topic]}"')
-                    check_quest_availability(player, quests, "ask_topic", dialogue_key)
-                    check_collect_quests(player, quests)
+                    check_quest_availability(player, quests, indexes, "ask_topic", dialogue_key)
+                    check_collect_quests(player, quests, indexes)
                 else:
                     print(f"{npc_to_ask.name} has nothing to say about {topic}.")
             else:
@@ -502,6 +1183,18 @@ def main():
                     player.heal(service['amount'])
             else:
                 print("There is no one here who can heal you.")
+        elif command == "arena":
+            arena_npc = None
+            for npc_name in current_loc.npcs:
+                npc = npcs[npc_name]
+                if hasattr(npc, 'services') and "arena" in npc.services:
+                    arena_npc = npc
+                    break
+
+            if arena_npc:
+                handle_arena(player, arena_npc, monsters, items)
+            else:
+                print("There is no arena here.")
         elif command == "rest":
             if hasattr(current_loc, 'healing_station') and current_loc.healing_station:
                 station = current_loc.healing_station
@@ -532,7 +1225,7 @@ def main():
                 continue
 
             player.dialogue_history.add(npc_to_talk.name)
-            check_collect_quests(player, quests, talked_to_npc=npc_to_talk)
+            check_collect_quests(player, quests, indexes, talked_to_npc=npc_to_talk)
 
             quest_offered_this_interaction = False
             # Iterate through the NPC's quest list in order to find the first one to offer
@@ -643,7 +1336,7 @@ def main():
                 player.inventory.remove(item_to_use.name)
                 if player.current_combat_target:
                     if not handle_monster_turn(player, player.current_combat_target):
-                        print("You have been defeated. Game over.")
+                        print("Game over.")
                         break
             else:
                 print("You can't use that.")
@@ -677,20 +1370,25 @@ def main():
                 if not monster_name_to_attack:
                     print(f"You don't see a {target_name} here.")
                     continue
-                monster_prototype = monsters[monster_name_to_attack]
-                monster_to_attack = copy.deepcopy(monster_prototype)
-                player.current_combat_target = monster_to_attack
+                monster_to_attack = monster_combatant(monsters[monster_name_to_attack])
                 print("--- Combat Started ---")
                 print(f"You engage the {monster_to_attack.name} in combat!")
-            player_attack = player.get_attack_power()
-            monster_to_attack.hp -= player_attack
-            print(f"You attack the {monster_to_attack.name} for {player_attack} damage.")
+
+            # A normal fight is a one-enemy wave; drops are announced after the rewards.
+            fighter, enemies, events = resolve_round(player_combatant(player), [monster_to_attack], random)
+            monster_to_attack = enemies[0]
+            player.hp = fighter.hp
+            player.current_combat_target = monster_to_attack
+            print_combat_events([event for event in events if event[0] != "drop"])
             if monster_to_attack.hp <= 0:
                 defeated_monster = monster_to_attack
-                print(f"You defeated the {defeated_monster.name}!")
                 current_loc.active_monsters.remove(defeated_monster.name)
                 player.gain_xp(defeated_monster.xp)
-                for quest in player.active_quests.values():
+                # Only quests that mention this monster can make progress from the kill.
+                for quest_name in indexes['quests_by_reference'].get(('monsters', defeated_monster.name), []):
+                    quest = player.active_quests.get(quest_name)
+                    if not quest:
+                        continue
                     # Handle main goal
                     if quest.goal.get('type') == 'kill' and quest.goal.get('target') == defeated_monster.name:
                         quest.progress += 1
@@ -722,18 +1420,19 @@ def main():
                         print(f"The {defeated_monster.name} dropped a {loot_item}.")
 
                 # Handle drop table
-                if defeated_monster.drop_table:
-                    for drop in defeated_monster.drop_table:
-                        if random.random() < drop['chance']:
-                            current_loc.items.append(drop['item'])
-                            print(f"The {defeated_monster.name} also dropped a {drop['item']}!")
+                for event in events:
+                    if event[0] == "drop":
+                        current_loc.items.append(event[2])
+                        print(f"The {defeated_monster.name} also dropped a {event[2]}!")
 
                 player.current_combat_target = None
             else:
-                print(f"{monster_to_attack.name} has {monster_to_attack.hp} HP left.")
-                if not handle_monster_turn(player, monster_to_attack):
+                if player.hp <= 0:
+                    print("Game over.")
                     player.current_combat_target = None
                     break
+                print(f"{monster_to_attack.name} has {monster_to_attack.hp} HP left.")
+                print(f"You have {player.hp} HP left.")
         elif command == "help":
             print_help()
         else: